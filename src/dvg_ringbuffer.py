@@ -29,8 +29,11 @@ contiguous arrays at the same memory address each time again, such that compiler
 optimizations and data planning are made possible.
 
 When the ring buffer is not completely full, it will return its data as a
-contiguous C-style numpy array, but at different memory addresses. This is how
-the original ``numpy-buffer`` always operates.
+contiguous C-style numpy array as well, but not at a fixed memory address. When
+the data does not wrap around the end of the internal ring buffer array, it is
+returned as a view into that array. Otherwise, it is returned as a copy at a
+different memory address each time, which is how the original
+``numpy-buffer`` always operates.
 
 Commonly, ``collections.deque()`` is used to act as a ring buffer. The
 benefits of a deque is that it is thread safe and fast (enough) for most
@@ -49,11 +52,18 @@ container -- needs to be transformed into a numpy array. Because
       values in the returned data array is identical to changing values in the
       *unwrap* buffer.
 
+    * Likewise, the data array that is returned by a ring buffer that is not
+      full, but whose data does not wrap around the end of the internal array,
+      is a view into that internal array. Make a copy if you want to hold on to
+      the data while the ring buffer gets modified. Ring buffers with layout
+      ``"SoA"`` and a multi-column dtype always return a copy instead, because
+      a view into their internal array would not be C-contiguous.
+
 API
 ===
 
-``class RingBuffer(capacity, dtype=float, allow_overwrite=True)``
-----------------------------------------------------------------------
+``class RingBuffer(capacity, dtype=float, allow_overwrite=True, power_of_two=False, layout="AoS")``
+---------------------------------------------------------------------------------------------------
     Create a new ring buffer with the given capacity and element type.
 
         Args:
@@ -72,6 +82,25 @@ API
 
                 Default: ``True``
 
+            power_of_two (``bool``, optional):
+                If ``True``, round the capacity up to the next power of two.
+                Ring buffers with a power-of-two capacity wrap their indices
+                using a cheap bitmask instead of a modulo operation, which
+                speeds up indexing with arrays of indices.
+
+                Default: ``False``
+
+            layout (``str``, optional):
+                Memory layout of ring buffers with a multi-column dtype like
+                ``(float, 2)``. Either ``"AoS"`` (array of structures) to store
+                the rows contiguously, or ``"SoA"`` (structure of arrays) to
+                store each column contiguously. A full ring buffer always
+                returns a C-contiguous array, regardless of the layout. Only
+                dtypes with at most one sub-dimension are supported by
+                ``"SoA"``.
+
+                Default: ``"AoS"``
+
 Methods
 -------
 * ``clear()``
@@ -107,6 +136,11 @@ Methods
         rb.extend([2, 3])              #  [1, 2, 3]
         rb.extend([4, 5, 6, 7])        #  [5, 6, 7]
 
+* ``append_batch(values)``
+    Identical to ``extend(values)``. Prefer this over a Python loop of
+    ``append()`` calls when receiving data in chunks, e.g. from a data
+    acquisition callback, as it copies the whole chunk in one go.
+
 * ``extendleft(values)``
     Extend the ring buffer with a list of values from the left side.
 
@@ -123,6 +157,16 @@ Methods
 * ``popleft()``
     Remove the left-most item from the ring buffer and return it.
 
+* ``column(i)``
+    Return column ``i`` of a ring buffer with a multi-column dtype. Identical
+    to ``rb[:, i]``, but contiguous when the layout is ``"SoA"``. A full
+    ``"SoA"`` ring buffer returns it at a fixed memory address per column.
+
+* ``RingBuffer.enable_pool(max_per_bucket=8)``
+    Static method to recycle the buffer arrays of destroyed ring buffers into
+    new ring buffers of the same capacity and dtype. Pass ``0`` to disable.
+    Disabled by default.
+
 Properties
 ----------
 * ``is_full``
@@ -162,6 +206,8 @@ __url__ = "https://github.com/Dennis-van-Gils/python-dvg-ringbuffer"
 __date__ = "28-05-2021"
 __version__ = "1.0.3"
 
+import mmap
+import sys
 from collections.abc import Sequence
 import numpy as np
 
@@ -171,6 +217,95 @@ import numpy as np
 # `numpy.concatenate()` functions appearing in this module, but timeit tests
 # reveal that it actually hurts the performance. Numpy has already optimised its
 # `concatenate()` method to maximum performance.
+#
+# The same holds for the single-element methods `append()`, `appendleft()`,
+# `pop()` and `popleft()`. Dispatching them to `numba.njit(cache=True)`
+# compiled helpers was timed at ~1 us per call versus ~0.4 us for the pure
+# Python code, because numba has to type-check the array argument on every
+# call. Instead, these methods are kept in pure Python, but with the index
+# bookkeeping inlined and the attribute lookups kept to a minimum. Generating a
+# specialized `append()` closure per instance via `exec()`, with the indices
+# held in 1-element lists, was timed no faster than the plain method either.
+# Nor was a branchless variant that keeps the indices modulo `2 * N` using
+# bitmasks: in CPython the extra arithmetic costs more than the `if` it saves.
+#
+# Likewise, `extend()` sticks to (at most) two slice assignments. A single
+# fancy-indexed store `self._arr[(np.arange(lv) + idx_R) & mask] = values`,
+# even with a preallocated index scratch array, was timed ~2x slower for chunks
+# of 4 to 256 values, and `ndarray.put(..., mode="wrap")` was never faster
+# either. Slice assignments boil down to a plain `memcpy`.
+#
+# The classic "magic ring buffer" trick, mapping the same physical memory pages
+# twice back-to-back, makes the data contiguous at any read offset without the
+# unwrap copy. It is not used here on purpose: the contiguous window then
+# starts at a different memory address after every append, whereas this ring
+# buffer guarantees one fixed address for its (full) data. Keeping the data
+# ordered at a fixed address inherently requires the unwrap copy.
+
+
+# Pool of recycled buffer arrays, keyed by `(shape, dtype, order)`. Disabled by
+# default, see `RingBuffer.enable_pool()`.
+_BUFFER_POOL = {}
+_POOL_MAX_PER_BUCKET = 0
+
+
+def _pool_key(shape, dtype, order):
+    # An array with at most one dimension longer than 1, e.g. any 1-D array, is
+    # both C- and F-contiguous. Key it the same regardless of requested order.
+    if sum(n > 1 for n in shape) <= 1:
+        order = "C"
+    return (shape, dtype, order)
+
+
+def _pool_pop(shape, dtype, order):
+    """Return a recycled array of the given shape, dtype and memory order, or a
+    newly allocated uninitialized one when the pool has none available.
+    """
+    bucket = _BUFFER_POOL.get(_pool_key(shape, dtype, order))
+    if bucket:
+        return bucket.pop()
+    return np.empty(shape, dtype=dtype, order=order)
+
+
+def _pool_push(arr):
+    """Hand an array back to the pool, unless its bucket is already full or
+    the array does not own its memory. Views taken from a non-owning array
+    reference its base instead of the array itself, hence they would escape
+    the reference count check in `RingBuffer.__del__()`.
+    """
+    if not arr.flags.owndata:
+        return
+    order = "C" if arr.flags.c_contiguous else "F"
+    bucket = _BUFFER_POOL.setdefault(
+        _pool_key(arr.shape, arr.dtype, order), []
+    )
+    if len(bucket) < _POOL_MAX_PER_BUCKET:
+        bucket.append(arr)
+
+
+# Unwrap buffers of at least this size get aligned to, and backed by,
+# transparent huge pages when the OS supports it (Linux). Consumers streaming
+# through such large buffers, like pyFFTW and numba, then suffer far less from
+# TLB misses.
+_HUGE_PAGE_SIZE = 2 * 1024 * 1024
+
+
+def _empty_huge_pages(shape, dtype, order):
+    """Return an uninitialized array aligned to a huge page boundary, for which
+    the kernel is advised to use transparent huge pages. The array does not
+    own its memory, hence it never gets recycled by the buffer pool.
+    """
+    count = int(np.prod(shape))
+    mm = mmap.mmap(-1, count * dtype.itemsize + _HUGE_PAGE_SIZE)
+    try:
+        mm.madvise(mmap.MADV_HUGEPAGE)  # pylint: disable=no-member
+    except OSError:
+        pass  # Kernel without huge page support: Still aligned, so no harm
+    offset = -np.frombuffer(mm, dtype=np.uint8).ctypes.data % _HUGE_PAGE_SIZE
+    arr = np.frombuffer(mm, dtype=dtype, count=count, offset=offset)
+    if arr.shape == shape:
+        return arr  # The array keeps `mm` alive
+    return arr.reshape(shape, order=order)
 
 
 class RingBuffer(Sequence):
@@ -191,24 +326,149 @@ class RingBuffer(Sequence):
             already full buffer.
 
             Default: True
+
+        power_of_two (bool, optional):
+            If True, round the capacity up to the next power of two. Ring
+            buffers with a power-of-two capacity wrap their indices using a
+            bitmask instead of a modulo operation.
+
+            Default: False
+
+        layout (str, optional):
+            Memory layout of ring buffers with a multi-column dtype like
+            (float, 2). Either "AoS" (array of structures) to store the rows
+            contiguously, or "SoA" (structure of arrays) to store each column
+            contiguously. The latter benefits consumers that process the
+            columns independently, see `column()`. Only dtypes with at most
+            one sub-dimension are supported by "SoA".
+
+            Default: "AoS"
     """
 
-    def __init__(self, capacity, dtype=float, allow_overwrite=True):
+    # Fixed attribute slots instead of a per-instance `__dict__`: Attribute
+    # access, which dominates the single-element methods, becomes a direct
+    # C-level slot load.
+    __slots__ = (
+        "_arr",
+        "_unwrap_buffer",
+        "_column_buffer",
+        "_N",
+        "_mask",
+        "_allow_overwrite",
+        "_idx_L",
+        "_idx_R",
+        "_unwrap_buffer_is_dirty",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        capacity,
+        dtype=float,
+        allow_overwrite=True,
+        power_of_two=False,
+        layout="AoS",
+    ):
+        if layout not in ("AoS", "SoA"):
+            raise ValueError(
+                "Invalid layout %r. Must be 'AoS' or 'SoA'." % (layout,)
+            )
+        if power_of_two and capacity > 0:
+            capacity = 1 << (capacity - 1).bit_length()
+
+        dt = np.dtype(dtype)
+        if layout == "SoA" and dt.ndim > 1:
+            raise ValueError(
+                "Layout 'SoA' supports dtypes with at most one sub-dimension, "
+                "got %s." % (dt,)
+            )
+        shape = (capacity,) + dt.shape  # E.g. dtype `(float, 2)`
+        order = "F" if layout == "SoA" else "C"
+        self._arr = _pool_pop(shape, dt.base, order)
         if dtype == float:
-            p = {"shape": capacity, "fill_value": np.nan, "order": "C"}
-            self._arr = np.full(**p)
-            self._unwrap_buffer = np.full(**p)  # @ fixed memory address
+            self._arr.fill(np.nan)
+        else:
+            # The zero of the dtype itself, e.g. '' for strings
+            self._arr[...] = np.zeros((), dtype=dt.base)
+
+        # The unwrap buffer gets completely overwritten by
+        # `_unwrap_into_buffer()` before it is ever read, hence there is no
+        # need to spend time on initializing its memory. It is always
+        # C-ordered, regardless of the layout. For "SoA", the copy into it
+        # transposes the columns.
+        # @ fixed memory address
+        # Object dtypes can not live in raw memory, hence they are excluded.
+        if (
+            self._arr.nbytes >= _HUGE_PAGE_SIZE
+            and hasattr(mmap, "MADV_HUGEPAGE")
+            and not dt.hasobject
+        ):
+            self._unwrap_buffer = _empty_huge_pages(shape, dt.base, "C")
         else:
-            p = {"shape": capacity, "dtype": dtype, "order": "C"}
-            self._arr = np.zeros(**p)
-            self._unwrap_buffer = np.zeros(**p)  # @ fixed memory address
+            self._unwrap_buffer = _pool_pop(shape, dt.base, "C")
+
+        # Fortran-ordered counterpart, from which `column()` hands out the
+        # columns of a full "SoA" ring buffer contiguously
+        # @ fixed memory address
+        if layout == "SoA":
+            self._column_buffer = _pool_pop(shape, dt.base, "F")
+        else:
+            self._column_buffer = None
 
         self._N = capacity
+        if capacity > 0 and capacity & (capacity - 1) == 0:
+            self._mask = capacity - 1  # Power of two: wrap using bitmask
+        else:
+            self._mask = None  # Wrap using modulo
         self._allow_overwrite = allow_overwrite
         self._idx_L = 0  # left index
         self._idx_R = 0  # right index
         self._unwrap_buffer_is_dirty = False
 
+    # --------------------------------------------------------------------------
+    #   Buffer pool
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def enable_pool(max_per_bucket=8):
+        """Recycle the buffer arrays of destroyed ring buffers, such that new
+        ring buffers of the same capacity and dtype can reuse them instead of
+        allocating fresh memory. Useful when many short-lived ring buffers are
+        created, like in rolling-window computations.
+
+        An array is only recycled when no one else holds a reference to it
+        anymore, e.g. a previously returned full ring buffer.
+
+        Args:
+            max_per_bucket (int, optional):
+                Maximum number of arrays to keep per `(shape, dtype)`
+                combination. Pass 0 to disable pooling and to release all
+                pooled arrays.
+
+                Default: 8
+        """
+        global _POOL_MAX_PER_BUCKET  # pylint: disable=global-statement
+        _POOL_MAX_PER_BUCKET = max_per_bucket
+        for bucket in _BUFFER_POOL.values():
+            del bucket[max_per_bucket:]
+
+    def __del__(self):
+        if _POOL_MAX_PER_BUCKET == 0 or not hasattr(self, "_unwrap_buffer"):
+            return
+
+        # A reference count of 2 means the array is referenced only by this
+        # instance and by the argument to `getrefcount()`. Any outstanding
+        # view or array handed out to the user increases the count.
+        if sys.getrefcount(self._arr) <= 2:
+            _pool_push(self._arr)
+        if sys.getrefcount(self._unwrap_buffer) <= 2:
+            _pool_push(self._unwrap_buffer)
+        if (
+            self._column_buffer is not None
+            and sys.getrefcount(self._column_buffer) <= 2
+        ):
+            _pool_push(self._column_buffer)
+
     # --------------------------------------------------------------------------
     #   clear
     # --------------------------------------------------------------------------
@@ -217,12 +477,13 @@ class RingBuffer(Sequence):
         self._idx_L = 0
         self._idx_R = 0
 
+        # No need to fill the unwrap buffer, because it gets completely
+        # overwritten by `_unwrap_into_buffer()` before it is ever read again
+        self._unwrap_buffer_is_dirty = True
         if self._arr.dtype == float:
             self._arr.fill(np.nan)
-            self._unwrap_buffer.fill(np.nan)
         else:
             self._arr.fill(0)
-            self._unwrap_buffer.fill(0)
 
     # --------------------------------------------------------------------------
     #   append
@@ -237,19 +498,26 @@ class RingBuffer(Sequence):
         rb.append(3)                   # --> rb = [1, 2, 3]
         rb.append(4)                   # --> rb = [2, 3, 4]
         """
-        if self.is_full:
+        N = self._N
+        idx_L = self._idx_L
+        idx_R = self._idx_R
+        if idx_R - idx_L == N:
             if not self._allow_overwrite:
                 raise IndexError(
                     "Append to a full RingBuffer with overwrite disabled."
                 )
-            if self._N == 0:
+            if N == 0:
                 return  # Mimick behavior of deque(maxlen=0)
-            self._idx_L += 1
+            idx_L += 1
 
         self._unwrap_buffer_is_dirty = True
-        self._arr[self._idx_R % self._N] = value
-        self._idx_R += 1
-        self._fix_indices()
+        self._arr[idx_R % N] = value
+        idx_R += 1
+        if idx_L >= N:
+            idx_L -= N
+            idx_R -= N
+        self._idx_L = idx_L
+        self._idx_R = idx_R
 
     def appendleft(self, value):
         """Append a single value to the ring buffer from the left side.
@@ -260,19 +528,26 @@ class RingBuffer(Sequence):
         rb.appendleft(3)               # --> rb = [3, 2, 1]
         rb.appendleft(4)               # --> rb = [4, 3, 2]
         """
-        if self.is_full:
+        N = self._N
+        idx_L = self._idx_L
+        idx_R = self._idx_R
+        if idx_R - idx_L == N:
             if not self._allow_overwrite:
                 raise IndexError(
                     "Append to a full RingBuffer with overwrite disabled."
                 )
-            if self._N == 0:
+            if N == 0:
                 return  # Mimick behavior of deque(maxlen=0)
-            self._idx_R -= 1
+            idx_R -= 1
 
         self._unwrap_buffer_is_dirty = True
-        self._idx_L -= 1
-        self._fix_indices()
-        self._arr[self._idx_L] = value
+        idx_L -= 1
+        if idx_L < 0:
+            idx_L += N
+            idx_R += N
+        self._arr[idx_L] = value
+        self._idx_L = idx_L
+        self._idx_R = idx_R
 
     # --------------------------------------------------------------------------
     #   extend
@@ -287,7 +562,7 @@ class RingBuffer(Sequence):
         rb.extend([4, 5, 6, 7])        # --> rb = [5, 6, 7]
         """
         lv = len(values)
-        if len(self) + lv > self._N:
+        if self._idx_R - self._idx_L + lv > self._N:
             if not self._allow_overwrite:
                 raise IndexError(
                     "RingBuffer overflows, because overwrite is disabled."
@@ -295,6 +570,12 @@ class RingBuffer(Sequence):
             if self._N == 0:
                 return  # Mimick behavior of deque(maxlen=0)
 
+        # Convert only once, instead of having each slice below go through
+        # Python slicing of `values` in case it is, e.g., a list. A numpy
+        # array of matching dtype is passed through as is, without any copy or
+        # cast, and gets stored by a plain `memcpy`.
+        values = np.asarray(values, dtype=self._arr.dtype)
+
         self._unwrap_buffer_is_dirty = True
         if lv >= self._N:
             self._arr[...] = values[-self._N :]
@@ -303,16 +584,29 @@ class RingBuffer(Sequence):
             return
 
         ri = self._idx_R % self._N
-        sl1 = np.s_[ri : min(ri + lv, self._N)]
-        sl2 = np.s_[: max(ri + lv - self._N, 0)]
-        # fmt: off
-        self._arr[sl1] = values[: sl1.stop - sl1.start]  # pylint: disable=no-member
-        self._arr[sl2] = values[sl1.stop - sl1.start :]  # pylint: disable=no-member
-        # fmt: on
+        n1 = min(lv, self._N - ri)  # Number of values up to the array end
+        self._arr[ri : ri + n1] = values[:n1]
+        if n1 < lv:
+            self._arr[: lv - n1] = values[n1:]  # Wrap around
         self._idx_R += lv
         self._idx_L = max(self._idx_L, self._idx_R - self._N)
         self._fix_indices()
 
+    def append_batch(self, values):
+        """Append a batch of values, e.g. a chunk of samples received from a
+        data acquisition callback, to the ring buffer in one go. Identical to
+        `extend()`.
+
+        Prefer this over a Python loop calling `append()` for each value: the
+        whole batch gets copied with at most two `memcpy` operations, instead
+        of paying the Python overhead of `append()` per value.
+
+        rb = RingBuffer(5, dtype=int)  # --> rb = []
+        rb.append_batch([1, 2, 3])     # --> rb = [1, 2, 3]
+        rb.append_batch([4, 5, 6])     # --> rb = [2, 3, 4, 5, 6]
+        """
+        self.extend(values)
+
     def extendleft(self, values):
         """Extend the ring buffer with a list of values from the left side.
 
@@ -322,7 +616,7 @@ class RingBuffer(Sequence):
         rb.extendleft([7, 6, 5, 4])    # --> rb = [7, 6, 5]
         """
         lv = len(values)
-        if len(self) + lv > self._N:
+        if self._idx_R - self._idx_L + lv > self._N:
             if not self._allow_overwrite:
                 raise IndexError(
                     "RingBuffer overflows, because overwrite is disabled."
@@ -330,6 +624,9 @@ class RingBuffer(Sequence):
             if self._N == 0:
                 return  # Mimick behavior of deque(maxlen=0)
 
+        # Convert only once, see `extend()`
+        values = np.asarray(values, dtype=self._arr.dtype)
+
         self._unwrap_buffer_is_dirty = True
         if lv >= self._N:
             self._arr[...] = values[: self._N]
@@ -340,12 +637,10 @@ class RingBuffer(Sequence):
         self._idx_L -= lv
         self._fix_indices()
         li = self._idx_L
-        sl1 = np.s_[li : min(li + lv, self._N)]
-        sl2 = np.s_[: max(li + lv - self._N, 0)]
-        # fmt: off
-        self._arr[sl1] = values[:sl1.stop - sl1.start]  # pylint: disable=no-member
-        self._arr[sl2] = values[sl1.stop - sl1.start:]  # pylint: disable=no-member
-        # fmt: on
+        n1 = min(lv, self._N - li)  # Number of values up to the array end
+        self._arr[li : li + n1] = values[:n1]
+        if n1 < lv:
+            self._arr[: lv - n1] = values[n1:]  # Wrap around
         self._idx_R = min(self._idx_R, self._idx_L + self._N)
 
     # --------------------------------------------------------------------------
@@ -353,22 +648,59 @@ class RingBuffer(Sequence):
     # --------------------------------------------------------------------------
 
     def pop(self):
-        if len(self) == 0:
+        if self._idx_R == self._idx_L:
             raise IndexError("Pop from an empty RingBuffer.")
         self._unwrap_buffer_is_dirty = True
         self._idx_R -= 1
-        self._fix_indices()
         return self._arr[self._idx_R % self._N]
 
     def popleft(self):
-        if len(self) == 0:
+        idx_L = self._idx_L
+        if self._idx_R == idx_L:
             raise IndexError("Pop from an empty RingBuffer.")
         self._unwrap_buffer_is_dirty = True
-        res = self._arr[self._idx_L]
-        self._idx_L += 1
-        self._fix_indices()
+        res = self._arr[idx_L]
+        idx_L += 1
+        if idx_L >= self._N:
+            idx_L -= self._N
+            self._idx_R -= self._N
+        self._idx_L = idx_L
         return res
 
+    # --------------------------------------------------------------------------
+    #   column
+    # --------------------------------------------------------------------------
+
+    def column(self, i):
+        """Return column `i` of a ring buffer with a multi-column dtype like
+        (float, 2). Identical to `rb[:, i]`, but contiguous when the ring
+        buffer has layout "SoA" and is completely full, in which case it is
+        unwrapped into a column buffer at a fixed memory address per column.
+        When not full, a contiguous copy is returned, regardless of the
+        layout.
+        """
+        if self.is_full:
+            if self._column_buffer is None:
+                self._unwrap_into_buffer()
+                return self._unwrap_buffer[:, i]
+
+            # Only this column gets unwrapped
+            idx_L = self._idx_L
+            split = self._N - idx_L
+            col = self._arr[:, i]
+            out = self._column_buffer[:, i]
+            out[:split] = col[idx_L:]
+            out[split:] = col[:idx_L]
+            return out
+
+        col = self._arr[:, i]
+        return np.concatenate(
+            (
+                col[self._idx_L : min(self._idx_R, self._N)],
+                col[: max(self._idx_R - self._N, 0)],
+            )
+        )
+
     # --------------------------------------------------------------------------
     #   Properties
     # --------------------------------------------------------------------------
@@ -388,6 +720,9 @@ class RingBuffer(Sequence):
     def current_address(self):
         """Get the current memory address of the array behind the buffer.
         """
+        if self.is_full:
+            # No need to unwrap just to find out the address
+            return self.unwrap_address
         return self[:].__array_interface__["data"][0]
 
     @property
@@ -407,14 +742,22 @@ class RingBuffer(Sequence):
     # --------------------------------------------------------------------------
 
     def _unwrap(self):
-        """Copy the data from this buffer into unwrapped form.
+        """Return the data from this buffer in unwrapped form as a C-contiguous
+        array. When the data does not wrap around the end of the internal array
+        and that array is C-ordered, this is a view instead of a copy.
         """
-        return np.concatenate(
-            (
-                self._arr[self._idx_L : min(self._idx_R, self._N)],
-                self._arr[: max(self._idx_R - self._N, 0)],
-            )
-        )
+        idx_L = self._idx_L
+        idx_R = self._idx_R
+        if idx_R <= self._N and self._arr.flags.c_contiguous:
+            return self._arr[idx_L:idx_R]
+
+        # Allocated C-ordered, also when the internal array is F-ordered
+        n = idx_R - idx_L
+        out = np.empty((n,) + self._arr.shape[1:], dtype=self._arr.dtype)
+        split = min(idx_R, self._N) - idx_L
+        out[:split] = self._arr[idx_L : idx_L + split]
+        out[split:] = self._arr[: n - split]
+        return out
 
     # --------------------------------------------------------------------------
     #   _unwrap_into_buffer
@@ -425,18 +768,14 @@ class RingBuffer(Sequence):
         buffer at a fixed memory address. Only call when the buffer is full.
         """
         if self._unwrap_buffer_is_dirty:
-            # print("Unwrap buffer was dirty")
-            np.concatenate(
-                (
-                    self._arr[self._idx_L : min(self._idx_R, self._N)],
-                    self._arr[: max(self._idx_R - self._N, 0)],
-                ),
-                out=self._unwrap_buffer,
-            )
+            # Two direct slice copies are cheaper than `np.concatenate(...,
+            # out=self._unwrap_buffer)`, which has to build a tuple and
+            # validate the shapes and dtypes of its arguments on every call.
+            idx_L = self._idx_L
+            split = min(self._idx_R, self._N) - idx_L
+            self._unwrap_buffer[:split] = self._arr[idx_L : idx_L + split]
+            self._unwrap_buffer[split:] = self._arr[: self._N - split]
             self._unwrap_buffer_is_dirty = False
-        else:
-            # print("Unwrap buffer was clean")
-            pass
 
     # --------------------------------------------------------------------------
     #   _fix_indices
@@ -456,21 +795,53 @@ class RingBuffer(Sequence):
     #   Dunder methods
     # --------------------------------------------------------------------------
 
-    def __array__(self):
-        """Numpy compatibility
+    def __array__(self, dtype=None, copy=None):
+        """Numpy compatibility. Accepts the `dtype` and `copy` arguments of
+        the Numpy 2 protocol, such that `np.asarray(rb, copy=False)` hands out
+        the unwrap buffer of a full ring buffer without any detour.
         """
-        # print("__array__")
         if self.is_full:
             self._unwrap_into_buffer()
-            return self._unwrap_buffer
+            arr = self._unwrap_buffer
         else:
-            return self._unwrap()
+            arr = self._unwrap()
+            if copy is False and arr.flags.owndata:
+                # Data wrapping around, hence concatenated into a new array
+                raise ValueError(
+                    "Unable to avoid a copy while unwrapping the RingBuffer."
+                )
+
+        if dtype is not None and np.dtype(dtype) != arr.dtype:
+            if copy is False:
+                raise ValueError(
+                    "Unable to avoid a copy while casting the RingBuffer to "
+                    "dtype %s." % np.dtype(dtype)
+                )
+            return arr.astype(dtype)
+        if copy:
+            return arr.copy()
+        return arr
 
     def __len__(self):
         return self._idx_R - self._idx_L
 
     def __getitem__(self, item):
 
+        # --------------------------
+        #   ringbuffer[int]: fast path
+        # --------------------------
+        # Bypasses the numpy machinery below for the most common case. Indices
+        # that are out of range fall through, such that the error handling
+        # below applies.
+
+        n = self._idx_R - self._idx_L  # Length, computed only once
+
+        if type(item) is int:  # Not `isinstance`, because that includes bool
+            if 0 <= item < n:
+                return self._arr[(self._idx_L + item) % self._N]
+            if 0 > item >= -n:
+                return self._arr[(self._idx_R + item) % self._N]
+
         # --------------------------
         #   ringbuffer[slice]
         #   ringbuffer[tuple]
@@ -478,12 +849,10 @@ class RingBuffer(Sequence):
         # --------------------------
 
         if isinstance(item, (slice, tuple)) or item is None:
-            if self.is_full:
-                # print("  --> _unwrap_buffer[item]")
+            if n == self._N:
                 self._unwrap_into_buffer()
                 return self._unwrap_buffer[item]
 
-            # print("  --> _unwrap()[item]")
             return self._unwrap()[item]
 
         # ----------------------------------
@@ -496,7 +865,7 @@ class RingBuffer(Sequence):
         if not issubclass(item_arr.dtype.type, np.integer):
             raise TypeError("RingBuffer indices must be integers.")
 
-        if len(self) == 0:
+        if n == 0:
             raise IndexError(
                 "RingBuffer list index out of range. The RingBuffer has "
                 "length 0."
@@ -504,13 +873,11 @@ class RingBuffer(Sequence):
 
         if not hasattr(item, "__len__"):
             # Single element: We can speed up the code
-            # print("  --> single element")
-
             # Check for `List index out of range`
-            if item_arr < -len(self) or item_arr >= len(self):
+            if item_arr < -n or item_arr >= n:
                 raise IndexError(
                     "RingBuffer list index %s out of range. The RingBuffer "
-                    "has length %s." % (item_arr, len(self))
+                    "has length %s." % (item_arr, n)
                 )
 
             if item_arr < 0:
@@ -520,30 +887,28 @@ class RingBuffer(Sequence):
 
         else:
             # Multiple elements
-            # print("  --> multiple elements")
-
             # Check for `List index out of range`
-            if np.any(item_arr < -len(self)) or np.any(item_arr >= len(self)):
-                idx_under = item_arr[np.where(item_arr < -len(self))]
-                idx_over = item_arr[np.where(item_arr >= len(self))]
-                idx_oor = np.sort(np.concatenate((idx_under, idx_over)))
+            is_oor = (item_arr < -n) | (item_arr >= n)
+            if is_oor.any():
                 raise IndexError(
                     "RingBuffer list indices %s out of range. The RingBuffer "
-                    "has length %s." % (idx_oor, len(self))
+                    "has length %s." % (np.sort(item_arr[is_oor]), n)
                 )
-            idx_neg = np.where(item_arr < 0)
-            idx_pos = np.where(item_arr >= 0)
-
-            if len(idx_neg) > 0:
-                item_arr[idx_neg] = (self._idx_R + item_arr[idx_neg]) % self._N
-            if len(idx_pos) > 0:
-                item_arr[idx_pos] = (item_arr[idx_pos] + self._idx_L) % self._N
+            # NOTE: Don't modify `item_arr` in-place, because it might be the
+            # very array that was passed by the user. Cast first, because
+            # adding signed indices to unsigned ones would promote to float.
+            item_arr = item_arr.astype(np.intp, copy=False)
+            item_arr = item_arr + np.where(
+                item_arr < 0, self._idx_R, self._idx_L
+            )
+            if self._mask is None:
+                item_arr %= self._N
+            else:
+                item_arr &= self._mask
 
-        # print("  --> _arr[item_arr]")
         return self._arr[item_arr]
 
     def __iter__(self):
-        # print("__iter__")
         if self.is_full:
             self._unwrap_into_buffer()
             return iter(self._unwrap_buffer)
@@ -1,3 +1,4 @@
+import mmap
 import unittest
 import numpy as np
 from dvg_ringbuffer import RingBuffer
@@ -17,6 +18,9 @@ class TestAll(unittest.TestCase):
         r.clear()
         self.assertEqual(r.dtype, np.dtype(bool))
 
+        r = RingBuffer(3, dtype=str)
+        np.testing.assert_equal(r._arr, ["", "", ""])
+
     def test_sizes(self):
         r = RingBuffer(5, dtype=(int, 2))
         self.assertEqual(r.maxlen, 5)
@@ -105,6 +109,14 @@ class TestAll(unittest.TestCase):
         r.extend([1, 2, 3, 4, 5, 6, 7])
         np.testing.assert_equal(r, np.array([3, 4, 5, 6, 7]))
 
+    def test_append_batch(self):
+        r = RingBuffer(5)
+        r.append_batch(np.array([1, 2, 3]))
+        np.testing.assert_equal(r, np.array([1, 2, 3]))
+
+        r.append_batch([4, 5, 6])
+        np.testing.assert_equal(r, np.array([2, 3, 4, 5, 6]))
+
     def test_pops(self):
         r = RingBuffer(3)
         r.append(1)
@@ -147,6 +159,52 @@ class TestAll(unittest.TestCase):
         np.testing.assert_equal(r[0, :], [5, 6])
         np.testing.assert_equal(r[:, 0], [5, 1, 3])
 
+    def test_soa(self):
+        r = RingBuffer(4, dtype=(float, 2), layout="SoA")
+        r.append([1, 2])
+        r.extend([[3, 4], [5, 6]])
+        np.testing.assert_equal(r, np.array([[1, 2], [3, 4], [5, 6]]))
+        np.testing.assert_equal(r[1], [3, 4])
+        np.testing.assert_equal(r[:, 1], [2, 4, 6])
+        np.testing.assert_equal(r.column(0), [1, 3, 5])
+        self.assertTrue(r.column(0).flags.c_contiguous)
+        self.assertTrue(np.asarray(r).flags.c_contiguous)
+
+        r.extend([[7, 8], [9, 10]])
+        np.testing.assert_equal(
+            r, np.array([[3, 4], [5, 6], [7, 8], [9, 10]])
+        )
+        col = r.column(1)
+        np.testing.assert_equal(col, [4, 6, 8, 10])
+        self.assertTrue(col.flags.c_contiguous)
+
+        # Fixed memory address per column
+        r.append([11, 12])
+        col_2 = r.column(1)
+        np.testing.assert_equal(col_2, [6, 8, 10, 12])
+        self.assertEqual(
+            col_2.__array_interface__["data"][0],
+            col.__array_interface__["data"][0],
+        )
+
+        # Not full and wrapping around
+        r.popleft()
+        a = np.asarray(r)
+        np.testing.assert_equal(a, [[7, 8], [9, 10], [11, 12]])
+        self.assertTrue(a.flags.c_contiguous)
+        r.appendleft([5, 6])
+
+        # A full ring buffer still returns a C-contiguous array
+        a = np.asarray(r)
+        np.testing.assert_equal(a, [[5, 6], [7, 8], [9, 10], [11, 12]])
+        self.assertTrue(a.flags.c_contiguous)
+        self.assertEqual(a.__array_interface__["data"][0], r.unwrap_address)
+
+        with self.assertRaisesRegex(ValueError, "layout"):
+            RingBuffer(4, dtype=(float, 2), layout="foo")
+        with self.assertRaisesRegex(ValueError, "sub-dimension"):
+            RingBuffer(4, dtype=(float, (2, 3)), layout="SoA")
+
     def test_iter(self):
         r = RingBuffer(5)
         for i in range(3):
@@ -231,12 +289,158 @@ class TestAll(unittest.TestCase):
         np.testing.assert_equal(len(r), 0)
         self.assertNotEqual(r.current_address, r.unwrap_address)
 
+        # Not full and not wrapped: A view without copying
+        r.extend([1, 2])
+        self.assertEqual(
+            r.current_address, r._arr.__array_interface__["data"][0]
+        )
+
+    def test_power_of_two(self):
+        r = RingBuffer(5, power_of_two=True)
+        self.assertEqual(r.maxlen, 8)
+        self.assertEqual(RingBuffer(8, power_of_two=True).maxlen, 8)
+        self.assertEqual(RingBuffer(1, power_of_two=True).maxlen, 1)
+        self.assertEqual(RingBuffer(0, power_of_two=True).maxlen, 0)
+
+        r.extend(np.arange(11))
+        expected = np.arange(3, 11)
+        np.testing.assert_equal(r, expected)
+
+        ii = np.array([0, -1, 7, -8, 3])
+        np.testing.assert_equal(r[ii], expected[ii])
+        np.testing.assert_equal(ii, [0, -1, 7, -8, 3])  # Left untouched
+
+        # Unsigned indices, both with and without the power-of-two mask
+        ii = np.array([0, 2, 7], dtype=np.uint64)
+        np.testing.assert_equal(r[ii], expected[ii])
+        r = RingBuffer(5)
+        r.extend(np.arange(7))
+        np.testing.assert_equal(r[ii[:2]], [2, 4])
+
+    def test_pool(self):
+        def addresses(rb):
+            return {
+                rb._arr.__array_interface__["data"][0],
+                rb._unwrap_buffer.__array_interface__["data"][0],
+            }
+
+        RingBuffer.enable_pool()
+        try:
+            r = RingBuffer(7)
+            r.extend([1, 2, 3])
+            old_addresses = addresses(r)
+            del r
+
+            # The recycled arrays must be reset
+            r = RingBuffer(7)
+            self.assertEqual(addresses(r), old_addresses)
+            np.testing.assert_equal(r, np.array([]))
+            np.testing.assert_equal(r._arr, np.full(7, np.nan))
+
+            # 1-D arrays are both C- and F-contiguous, so get shared by layouts
+            del r
+            r = RingBuffer(7, layout="SoA")
+            self.assertEqual(addresses(r), old_addresses)
+
+            # Arrays still referenced by the user must not be recycled
+            r.extend(np.arange(7))
+            data = np.asarray(r)
+            del r
+            r = RingBuffer(7)
+            self.assertNotEqual(r.unwrap_address, data.ctypes.data)
+            r.extend(np.zeros(7))
+            np.testing.assert_equal(data, np.arange(7))
+
+            # Arrays not owning their memory must never be recycled: a view
+            # handed out to the user would not count as a reference to them
+            r = RingBuffer(7)
+            r._unwrap_buffer = r._unwrap_buffer[:]
+            r.extend(np.arange(7))
+            data = r[:]
+            del r
+            r = RingBuffer(7)
+            r.extend(np.zeros(7))
+            np.testing.assert_equal(r[:], np.zeros(7))
+            np.testing.assert_equal(data, np.arange(7))
+        finally:
+            RingBuffer.enable_pool(0)
+
+    def test_array_protocol(self):
+        r = RingBuffer(5)
+        r.extend([1, 2, 3, 4, 5])
+
+        a = np.asarray(r)
+        self.assertEqual(a.__array_interface__["data"][0], r.unwrap_address)
+
+        a = np.asarray(r, dtype=np.float32)
+        self.assertEqual(a.dtype, np.float32)
+        np.testing.assert_equal(a, [1, 2, 3, 4, 5])
+
+        a = np.array(r, copy=True)
+        self.assertNotEqual(a.__array_interface__["data"][0], r.unwrap_address)
+        np.testing.assert_equal(a, [1, 2, 3, 4, 5])
+
+        a = r.__array__(copy=False)
+        self.assertEqual(a.__array_interface__["data"][0], r.unwrap_address)
+        with self.assertRaisesRegex(ValueError, "copy"):
+            r.__array__(dtype=np.float32, copy=False)
+
+        # Not full and not wrapping around: a view
+        r.popleft()
+        a = r.__array__(copy=False)
+        self.assertTrue(np.shares_memory(a, r._arr))
+        np.testing.assert_equal(a, [2, 3, 4, 5])
+
+        # Not full and wrapping around: a copy can not be avoided
+        r.popleft()
+        r.append(6)
+        with self.assertRaisesRegex(ValueError, "copy"):
+            r.__array__(copy=False)
+        np.testing.assert_equal(r.__array__(), [3, 4, 5, 6])
+
+    @unittest.skipUnless(
+        hasattr(mmap, "MADV_HUGEPAGE"), "Transparent huge pages unsupported"
+    )
+    def test_huge_pages(self):
+        N = 2 ** 19  # 4 MB of float64
+        r = RingBuffer(N)
+        self.assertEqual(r.unwrap_address % (2 * 1024 * 1024), 0)
+
+        r.extend(np.arange(N + 3))
+        np.testing.assert_equal(r, np.arange(3, N + 3))
+        self.assertEqual(r.current_address, r.unwrap_address)
+
+        # Data handed out to the user must survive the buffer pool
+        RingBuffer.enable_pool()
+        try:
+            data = r[:]
+            del r
+            for _ in range(2):
+                r = RingBuffer(N)
+                r.extend(np.zeros(N))
+                np.testing.assert_equal(r[:], np.zeros(N))
+            np.testing.assert_equal(data, np.arange(3, N + 3))
+        finally:
+            RingBuffer.enable_pool(0)
+
+    def test_huge_pages_object_dtype(self):
+        # Object dtypes can not be backed by huge pages and must fall back
+        N = 2 ** 19
+        for dtype in (object, [("a", float), ("b", object)]):
+            r = RingBuffer(N, dtype=dtype)
+            r.append(r._arr[0])
+            self.assertEqual(len(r), 1)
+
     def test_errors(self):
         r = RingBuffer(5)
 
         r.extend([1, 2, 3, 4, 5])
         with self.assertRaisesRegex(TypeError, "integers"):
             r[2.0]
+        with self.assertRaisesRegex(TypeError, "integers"):
+            r[True]
+        with self.assertRaisesRegex(IndexError, "out of range"):
+            r[-6]
         with self.assertRaisesRegex(IndexError, "out of range"):
             r[5]
         with self.assertRaisesRegex(IndexError, "out of range"):
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Runs the benchmarks of `timeit_ringbuffers.py` through `pyperf`, which
+calibrates the number of loops, warms up, spreads the runs over multiple
+worker processes and reports the mean +- standard deviation. Requires::
+
+    pip install pyperf
+
+Usage::
+
+    python pyperf_ringbuffers.py [--include numpy] -o results.json
+    python -m pyperf compare_to before.json results.json
+
+Use the `--fast` or `--rigorous` options of `pyperf` to trade accuracy for
+time, and `--affinity` to pin the worker processes to CPU cores.
+"""
+
+import pyperf
+
+from timeit_ringbuffers import (
+    HAS_NP_RB,
+    add_include_argument,
+    make_setup,
+    select_benchmarks,
+    sizes,
+)
+
+
+def add_cmdline_args(cmd, args):
+    # Pass the included comparison targets on to the worker processes
+    for target in args.include:
+        cmd.extend(("--include", target))
+
+
+runner = pyperf.Runner(add_cmdline_args=add_cmdline_args)
+add_include_argument(runner.argparser)
+args = runner.parse_args()
+if "numpy" in args.include and not HAS_NP_RB:
+    runner.argparser.error("`numpy_ringbuffer` is not installed")
+
+for buffer_size, deque_size in sizes:
+    setup = make_setup(buffer_size, deque_size, args.include)
+    for _, modes in select_benchmarks(args.include):
+        for _, stmt in modes:
+            runner.timeit(
+                name="%s %d/%d" % (stmt[:-2], buffer_size, deque_size),
+                stmt=stmt,
+                setup=setup,
+            )
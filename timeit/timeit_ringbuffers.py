@@ -1,12 +1,34 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from timeit import timeit
+"""Benchmarks `dvg_ringbuffer` against `collections.deque` and, optionally,
+against `numpy_ringbuffer`. Usage::
 
-setup = """
+    python timeit_ringbuffers.py [--include numpy]
+
+`numpy_ringbuffer` is only benchmarked when included explicitly, which
+requires::
+
+    pip install numpy_ringbuffer
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+from timeit import Timer
+
+try:
+    import numpy_ringbuffer  # pylint: disable=unused-import
+
+    HAS_NP_RB = True
+except ImportError:
+    HAS_NP_RB = False
+
+setup_template = """
 import numpy as np
-from numpy_ringbuffer import RingBuffer
 from collections import deque
+import itertools
 
 import os,sys,inspect
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
@@ -14,53 +36,314 @@ parentdir = os.path.dirname(currentdir)
 sys.path.insert(0,parentdir)
 from dvg_ringbuffer import RingBuffer as DvG_RingBuffer
 
-np.random.seed(0)
-
 N_buffers_passed = 100
-buffer_size = 500
-deque_size  = 20500
+buffer_size = %(buffer_size)d
+deque_size  = %(deque_size)d
+include_numpy = %(include_numpy)r
 
-rb_dvg = DvG_RingBuffer(capacity=deque_size)
-rb_numpy = RingBuffer(capacity=deque_size)
-rb_deque = deque(maxlen=deque_size)
+if include_numpy:
+    from numpy_ringbuffer import RingBuffer
 
-def mode_dvg():
-    for i in range(N_buffers_passed):
-        rb_dvg.extend(np.random.randn(buffer_size))
+# The workload is memory bound: single precision halves the bytes moved around
+dtype = np.float32
 
-        if rb_dvg.is_full:
-            c = rb_dvg[0:100]
-            #d = np.asarray(rb_dvg)
+# Generate the test data up front, so that it does not get timed along with the
+# ring buffers. The values themselves have no bearing on the performance, so a
+# cheap and deterministic ramp suffices. It stays exactly representable in
+# single precision up to 2**24 values in total. All chunks share one array.
+# Each row is a contiguous chunk.
+chunks = np.arange(N_buffers_passed * buffer_size, dtype=dtype).reshape(
+    N_buffers_passed, buffer_size
+)
 
-            #print(c.__array_interface__['data'][0])
+# The deque gets fed the same chunks as lists of Python floats instead, which
+# is the right tool for the job for a deque: `deque.extend()` then only has to
+# increment the reference counts, instead of creating a new Python float out of
+# every single ndarray element. This asymmetry is deliberate, such that the
+# advantage of the NumPy based ring buffers does not get overstated.
+chunk_lists = [chunk.tolist() for chunk in chunks]
 
-def mode_numpy():
-    for i in range(N_buffers_passed):
-        rb_numpy.extend(np.random.randn(buffer_size))
+# The ring buffer implementations under test, as factories of empty buffers
+def new_dvg():
+    return DvG_RingBuffer(capacity=deque_size, dtype=dtype)
+
+def new_numpy():
+    return RingBuffer(capacity=deque_size, dtype=dtype)
 
-        if rb_numpy.is_full:
-            c = rb_numpy[0:100]
-            #d = np.asarray(rb_dvg)
+def new_deque():
+    return deque(maxlen=deque_size)
 
-            #print(c.__array_interface__['data'][0])
+# Each trial starts with a freshly created ring buffer, such that every trial
+# times the same workload: filling up, becoming full and wrapping around.
+# Otherwise, all but the first trial would only time the already-full state.
+def run_extend(new_rb, data=chunks):
+    rb = new_rb()
+    for chunk in data:
+        rb.extend(chunk)
 
-def mode_deque():
+def run_slice(rb, slicer):
     for i in range(N_buffers_passed):
-        rb_deque.extend(np.random.randn(buffer_size))
+        c = slicer(rb)
+
+def slice_ndarray(rb):
+    return rb[0:100]
+
+def slice_deque(rb):
+    # Only materialize the first 100 elements, instead of converting the whole
+    # deque of Python floats into an array
+    return np.fromiter(itertools.islice(rb, 100), dtype, count=100)
+
+def mode_dvg_extend():
+    run_extend(new_dvg)
 
-        if len(rb_deque) == rb_deque.maxlen:
-            c = (np.array(rb_deque))[0:100]
+def mode_numpy_extend():
+    run_extend(new_numpy)
 
-            #print(c.__array_interface__['data'][0])
+def mode_deque_extend():
+    run_extend(new_deque, chunk_lists)
 
+# All chunks at once in a single, giant `extend()`. Only the last `deque_size`
+# values get copied here, so compare its throughput, not its time, with
+# `mode_dvg_extend()` to quantify the per-call Python overhead of `extend()`.
+# For small chunks it can even beat `mode_memcpy_extend()`, which is the bound
+# for feeding chunk by chunk and pays its per-call overhead 100 times.
+# NOTE: `numpy_ringbuffer` ends up empty when extended with more values than
+# its capacity, so only `dvg_ringbuffer` gets timed.
+big_chunk = chunks.reshape(-1)  # View, no copy
+
+# Bytes actually copied per pass, for the feeding modes not copying all chunks
+bytes_moved = {
+    "mode_dvg_bulk()": min(chunks.size, deque_size) * chunks.itemsize,
+}
+
+def mode_dvg_bulk():
+    rb = new_dvg()
+    rb.extend(big_chunk)
+
+# Lower bound for extending: plain slice assignments of each chunk into an
+# array of the same capacity, which boils down to a `memcpy`. Any gap with
+# `mode_dvg_extend()` is pure ring buffer bookkeeping overhead. NOTE: Assumes
+# `deque_size` is a multiple of `buffer_size`, such that no chunk wraps around.
+arr_memcpy = np.empty(deque_size, dtype=dtype)
+
+def mode_memcpy_extend():
+    idx = 0
+    for chunk in chunks:
+        arr_memcpy[idx : idx + buffer_size] = chunk
+        idx = (idx + buffer_size) %% deque_size
+
+# The slice path is timed separately on already full ring buffers, such that a
+# regression in either path can not hide behind the other.
+rb_dvg_full = new_dvg()
+rb_deque_full = new_deque()
+for chunk, chunk_list in zip(chunks, chunk_lists):
+    rb_dvg_full.extend(chunk)
+    rb_deque_full.extend(chunk_list)
+
+if include_numpy:
+    rb_numpy_full = new_numpy()
+    for chunk in chunks:
+        rb_numpy_full.extend(chunk)
+
+def mode_dvg_slice():
+    run_slice(rb_dvg_full, slice_ndarray)
+
+def mode_numpy_slice():
+    run_slice(rb_numpy_full, slice_ndarray)
+
+def mode_deque_slice():
+    run_slice(rb_deque_full, slice_deque)
+
+# Lower bound for slicing: a bare view into the unwrap buffer of the full
+# `dvg_ringbuffer`. Any gap with `mode_dvg_slice()` is the per-call overhead of
+# `RingBuffer.__getitem__()`, as that too returns a view without copying.
+rb_dvg_full[:]  # Make sure the unwrap buffer is up-to-date
+
+def mode_dvg_view():
+    run_slice(rb_dvg_full._unwrap_buffer, slice_ndarray)
 """
 
-N = 100
-print("Feeding different ring buffers with data:")
+N_repeat = 5
+
+# (buffer_size, deque_size) to sweep over, such that the asymptotic cost of
+# each implementation becomes visible
+sizes = [(500, 20500), (5000, 205000), (50000, 2050000)]
+
+benchmarks = [
+    (
+        "Feeding different ring buffers with data:",
+        [
+            ("dvg_ringbuffer", "mode_dvg_extend()"),
+            ("dvg, one extend", "mode_dvg_bulk()"),
+            ("numpy_ringbuffer", "mode_numpy_extend()"),
+            ("deque", "mode_deque_extend()"),
+            ("memcpy (bound)", "mode_memcpy_extend()"),
+        ],
+    ),
+    (
+        "Slicing [0:100] out of full ring buffers:",
+        [
+            ("dvg_ringbuffer", "mode_dvg_slice()"),
+            ("bare view (bound)", "mode_dvg_view()"),
+            ("numpy_ringbuffer", "mode_numpy_slice()"),
+            ("deque", "mode_deque_slice()"),
+        ],
+    ),
+]
+
+# Modes of the optional comparison targets, only run when asked for
+optional_modes = {
+    "numpy": ("mode_numpy_extend()", "mode_numpy_slice()"),
+}
+
+
+def select_benchmarks(include):
+    """Return `benchmarks` without the modes of the optional comparison
+    targets that are not listed in `include`.
+    """
+    excluded = set()
+    for target, stmts in optional_modes.items():
+        if target not in include:
+            excluded.update(stmts)
+
+    return [
+        (title, [mode for mode in modes if mode[1] not in excluded])
+        for title, modes in benchmarks
+    ]
+
+
+def make_setup(buffer_size, deque_size, include):
+    return setup_template % {
+        "buffer_size": buffer_size,
+        "deque_size": deque_size,
+        "include_numpy": "numpy" in include,
+    }
+
+
+def make_namespace(buffer_size, deque_size, include):
+    """Execute the setup code for the given sizes only once, and return the
+    resulting namespace in which all modes get timed.
+    """
+    setup = make_setup(buffer_size, deque_size, include)
+    namespace = {}
+    exec(setup, namespace)  # pylint: disable=exec-used
+    return namespace
+
+
+def time_it(stmt, namespace, N):
+    """Return the time in ms per call of `stmt`. Takes the minimum over
+    `N_repeat` repeats of `N` calls each, as recommended by the `timeit`
+    documentation: higher values are caused by other processes interfering,
+    not by variability in the code under test. Note that `timeit` already
+    disables the garbage collector during timing.
+    """
+    gc.collect()  # Start each measurement with a clean slate
+    timer = Timer(stmt, globals=namespace)
+    timer.timeit(number=1)  # Warm up the caches and first-call code paths
+    return min(timer.repeat(repeat=N_repeat, number=N)) / N * 1000
+
+
+def peak_memory(stmt, namespace):
+    """Return the peak memory in kB traced during a single call of `stmt`.
+    NumPy reports its data allocations to `tracemalloc`, but memory mapped
+    regions (like a huge-page unwrap buffer) are not traced.
+    """
+    gc.collect()
+    tracemalloc.start()
+    eval(stmt, namespace)  # pylint: disable=eval-used
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def print_table(heading, selected, namespaces, measure, fmt):
+    print(heading + ". Columns: chunk size / capacity")
+    print(" " * 21, end="")
+    for buffer_size, deque_size in sizes:
+        print("%18s" % ("%d / %d" % (buffer_size, deque_size)), end="")
+    print()
+
+    for title, modes in selected:
+        print(title)
+        for label, stmt in modes:
+            print("  %-18s:" % label, end="", flush=True)
+            for (buffer_size, _), namespace in zip(sizes, namespaces):
+                print(fmt % measure(stmt, namespace, buffer_size), end="",
+                      flush=True)
+            print()
+
+
+def add_include_argument(parser):
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        choices=sorted(optional_modes),
+        help="also benchmark this optional comparison target",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_include_argument(parser)
+    args = parser.parse_args()
+    if "numpy" in args.include and not HAS_NP_RB:
+        parser.error("`numpy_ringbuffer` is not installed")
+
+    # Pin the process to a single CPU core to prevent cross-core migrations
+    # from adding noise to the timings (Linux only). For maximum effect, that
+    # core should be isolated from the OS scheduler by booting with
+    # `isolcpus=<core>`. Turbo boost and frequency scaling are left as is; they
+    # have to be disabled in the BIOS or via `cpupower`.
+    if hasattr(os, "sched_setaffinity"):
+        core = max(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {core})
+        print("Pinned to CPU core %d" % core)
+
+    selected = select_benchmarks(args.include)
+    namespaces = [make_namespace(*size, args.include) for size in sizes]
+
+    times = {}
+
+    def measure_time(stmt, namespace, buffer_size):
+        # Keep the total wall time per point bounded
+        N = max(1, 100 * 500 // buffer_size)
+        times[stmt, buffer_size] = time_it(stmt, namespace, N)
+        return times[stmt, buffer_size]
+
+    def throughput(stmt, namespace, buffer_size):
+        # Bytes copied per pass, against the timing of above
+        n_bytes = namespace["bytes_moved"].get(
+            stmt, namespace["chunks"].nbytes
+        )
+        return n_bytes / times[stmt, buffer_size] / 1e6
+
+    print_table(
+        "Time in ms per pass of 100 chunks",
+        selected,
+        namespaces,
+        measure_time,
+        "%18.3f",
+    )
+    print()
+    # Throughput makes it clear how close feeding the ring buffers comes to
+    # the memory bandwidth. It is meaningless for slicing out 100 values.
+    print_table(
+        "Throughput in GB/s of the bytes copied per pass",
+        selected[:1],
+        namespaces,
+        throughput,
+        "%18.2f",
+    )
+    print()
+    print_table(
+        "Peak traced memory in kB per pass of 100 chunks",
+        selected,
+        namespaces,
+        lambda stmt, ns, bs: peak_memory(stmt, ns),
+        "%18.0f",
+    )
+
 
-print("  dvg_ringbuffer   : ", end="")
-print("%.3f ms" % (timeit("mode_dvg()", setup=setup, number=N) / N * 1000))
-print("  numpy_ringbuffer : ", end="")
-print("%.3f ms" % (timeit("mode_numpy()", setup=setup, number=N) / N * 1000))
-print("  deque (slow!)    : ", end="")
-print("%.3f ms" % (timeit("mode_deque()", setup=setup, number=N) / N * 1000))
+if __name__ == "__main__":
+    main()